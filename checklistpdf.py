@@ -1,7 +1,10 @@
 """Generate Apocalypse World / Dungeon World style PDF checklists from Markdown."""
 
+import functools
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -10,6 +13,7 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.rl_config import _FUZZ
 from reportlab.platypus import (
     BaseDocTemplate,
     Frame,
@@ -34,6 +38,8 @@ GUTTER = 18
 
 CONTENT_W = PAGE_W - MARGIN_LEFT - MARGIN_RIGHT  # 504
 COL_W = (CONTENT_W - GUTTER) / 2  # 243
+COL_X_LEFT = MARGIN_LEFT
+COL_X_RIGHT = MARGIN_LEFT + COL_W + GUTTER
 
 TITLE_AREA_H = 50  # space reserved for H1 title on title pages
 TITLE_COL_H = PAGE_H - MARGIN_TOP - MARGIN_BOTTOM - TITLE_AREA_H  # 616
@@ -46,15 +52,35 @@ BOX_BG = WHITE
 
 FONT_DIR = Path(__file__).parent / "fonts"
 
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+# Classifies a markdown line in one match; m.lastgroup names the line kind.
+# Lines that match none of the alternatives are paragraph text.
+_LINE_RE = re.compile(
+    r"# (?P<page>.*)"
+    r"|## (?P<box>.*)"
+    r"|(?P<hrule>[ ]{0,3}(?P<rule_char>[-*_])(?:[ ]*(?P=rule_char)){2,}[ ]*)"
+    r"|- \[(?P<mark>[ xX])\] (?P<checkbox>.*)"
+    r"|- (?P<bullet>.*)"
+    r"|(?P<blank>\s*)"
+)
+
 # ---------------------------------------------------------------------------
 # Font registration
 # ---------------------------------------------------------------------------
 
 
+_FONTS_REGISTERED = False
+
+
 def register_fonts():
+    global _FONTS_REGISTERED
+    if _FONTS_REGISTERED:
+        return
     pdfmetrics.registerFont(TTFont("Inter", str(FONT_DIR / "Inter-Regular.ttf")))
     pdfmetrics.registerFont(TTFont("Inter-Bold", str(FONT_DIR / "Inter-Bold.ttf")))
     pdfmetrics.registerFontFamily("Inter", normal="Inter", bold="Inter-Bold")
+    _FONTS_REGISTERED = True
 
 
 # ---------------------------------------------------------------------------
@@ -92,20 +118,27 @@ CHECKBOX_TEXT_STYLE = ParagraphStyle(
 # ---------------------------------------------------------------------------
 
 
-@dataclass
-class Element:
-    kind: str  # "paragraph", "bullet", "checkbox", "hrule"
-    text: str
-    checked: bool = False
-
-
-@dataclass
+@dataclass(slots=True)
 class Box:
+    """A section; its elements are stored as parallel lists, one entry each."""
+
     title: str
-    elements: list[Element] = field(default_factory=list)
+    kinds: list[str] = field(default_factory=list)  # "paragraph", "bullet", "checkbox", "hrule"
+    texts: list[str] = field(default_factory=list)
+    checked: list[bool] = field(default_factory=list)
+
+    def add(self, kind: str, text: str, checked: bool = False):
+        self.kinds.append(kind)
+        self.texts.append(text)
+        self.checked.append(checked)
 
+    def pop(self):
+        self.kinds.pop()
+        self.texts.pop()
+        self.checked.pop()
 
-@dataclass
+
+@dataclass(slots=True)
 class Page:
     title: str
     boxes: list[Box] = field(default_factory=list)
@@ -118,11 +151,12 @@ class Page:
 
 def md_to_markup(text: str) -> str:
     """Convert **bold** markdown to <b> tags for reportlab."""
-    return re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    if "**" not in text:
+        return text
+    return _BOLD_RE.sub(r"<b>\1</b>", text)
 
 
 def parse_markdown(path: Path) -> list[Page]:
-    lines = path.read_text().splitlines()
     pages: list[Page] = []
     current_page: Page | None = None
     current_box: Box | None = None
@@ -130,9 +164,7 @@ def parse_markdown(path: Path) -> list[Page]:
 
     def flush_para():
         if para_lines and current_box is not None:
-            current_box.elements.append(
-                Element("paragraph", " ".join(para_lines))
-            )
+            current_box.add("paragraph", " ".join(para_lines))
             para_lines.clear()
 
     def flush_box():
@@ -140,8 +172,8 @@ def parse_markdown(path: Path) -> list[Page]:
         flush_para()
         if current_box is not None and current_page is not None:
             # Strip trailing hrules
-            while current_box.elements and current_box.elements[-1].kind == "hrule":
-                current_box.elements.pop()
+            while current_box.kinds and current_box.kinds[-1] == "hrule":
+                current_box.pop()
             current_page.boxes.append(current_box)
             current_box = None
 
@@ -152,34 +184,35 @@ def parse_markdown(path: Path) -> list[Page]:
             pages.append(current_page)
             current_page = None
 
-    for line in lines:
-        if line.startswith("# ") and not line.startswith("## "):
-            flush_page()
-            current_page = Page(title=line[2:].strip())
-        elif line.startswith("## "):
-            flush_box()
-            current_box = Box(title=line[3:].strip())
-        elif re.match(r"^[ ]{0,3}([-*_])([ ]*\1){2,}[ ]*$", line):
-            flush_para()
-            if current_box is not None:
-                current_box.elements.append(Element("hrule", ""))
-        elif line.startswith("- [ ] ") or line.startswith("- [x] ") or line.startswith("- [X] "):
-            flush_para()
-            if current_box is not None:
-                checked = line[3] in ("x", "X")
-                current_box.elements.append(
-                    Element("checkbox", line[6:].strip(), checked=checked)
-                )
-        elif line.startswith("- "):
-            flush_para()
-            if current_box is not None:
-                current_box.elements.append(
-                    Element("bullet", line[2:].strip())
-                )
-        elif line.strip() == "":
-            flush_para()
-        else:
-            para_lines.append(line.strip())
+    # Iterate the file lazily rather than holding the text and its line list
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            m = _LINE_RE.fullmatch(line)
+            kind = m.lastgroup if m else None
+            if kind == "page":
+                flush_page()
+                current_page = Page(title=m["page"].strip())
+            elif kind == "box":
+                flush_box()
+                current_box = Box(title=m["box"].strip())
+            elif kind == "hrule":
+                flush_para()
+                if current_box is not None:
+                    current_box.add("hrule", "")
+            elif kind == "checkbox":
+                flush_para()
+                if current_box is not None:
+                    checked = m["mark"] in ("x", "X")
+                    current_box.add("checkbox", m["checkbox"].strip(), checked=checked)
+            elif kind == "bullet":
+                flush_para()
+                if current_box is not None:
+                    current_box.add("bullet", m["bullet"].strip())
+            elif kind == "blank":
+                flush_para()
+            else:
+                para_lines.append(line.strip())
 
     flush_page()
     return pages
@@ -190,12 +223,83 @@ def parse_markdown(path: Path) -> list[Page]:
 # ---------------------------------------------------------------------------
 
 
+# Cleared if the reportlab internals CachedParagraph relies on stop working,
+# after which every CachedParagraph behaves as a plain Paragraph.
+_PARA_CACHE_OK = True
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_para(markup: str, style: ParagraphStyle):
+    """Parse *markup* into reportlab frags, returning (text, style, frags, bulletText)."""
+    para = Paragraph(markup, style)
+    return para.text, para.style, para.frags, para.bulletText
+
+
+@functools.lru_cache(maxsize=2048)
+def _layout_para(markup: str, style: ParagraphStyle, width: float):
+    """Line-break *markup* at *width*, returning (height, frags, blPara, wrapWidths)."""
+    _, style, frags, bullet_text = _parse_para(markup, style)
+    para = Paragraph(markup, style, bullet_text, frags=frags)
+    _, h = para.wrap(width, BODY_COL_H)
+    return h, para.frags, para.blPara, tuple(para._wrapWidths)
+
+
+class CachedParagraph(Paragraph):
+    """Paragraph that shares parsed frags and line breaks between identical instances."""
+
+    def __init__(self, text, style=None, *args, **kwargs):
+        global _PARA_CACHE_OK
+        self._markup = text
+        # The caches are keyed on markup and style only, so instances given
+        # extra Paragraph arguments (caseSensitive, encoding, or the frags
+        # passed by split()) take the uncached path
+        self._cacheable = (
+            _PARA_CACHE_OK
+            and text is not None
+            and not args
+            and not kwargs
+            and not getattr(style, "bulletText", None)
+        )
+        if self._cacheable:
+            try:
+                # Frags are only read after parsing (breakLines builds a new
+                # word list), so instances with the same markup and style can
+                # share them.
+                clean_text, style, frags, bullet_text = _parse_para(text, style)
+                super().__init__(text, style, bullet_text, frags=frags)
+                self.text = clean_text
+                return
+            except (TypeError, AttributeError):
+                _PARA_CACHE_OK = False
+                self._cacheable = False
+        super().__init__(text, style, *args, **kwargs)
+
+    def wrap(self, availWidth, availHeight):
+        global _PARA_CACHE_OK
+        if (not (self._cacheable and _PARA_CACHE_OK)
+                or self.bulletText or availWidth < _FUZZ):
+            return super().wrap(availWidth, availHeight)
+        try:
+            self.height, self.frags, self.blPara, wrap_widths = _layout_para(
+                self._markup, self.style, availWidth
+            )
+        except (TypeError, AttributeError):
+            _PARA_CACHE_OK = False
+            return super().wrap(availWidth, availHeight)
+        self._wrapWidths = list(wrap_widths)
+        self.width = availWidth
+        return (self.width, self.height)
+
+
 class SetTitle(Flowable):
-    """Zero-height flowable that stores the H1 title on the doc template."""
+    """Zero-height flowable that stores the H1 title on the doc template.
+
+    The title is upper-cased once here, ready for _draw_title_page.
+    """
 
     def __init__(self, title: str):
         super().__init__()
-        self.title = title
+        self.title = title.upper()
         self.width = 0
         self.height = 0
 
@@ -208,21 +312,24 @@ class SetTitle(Flowable):
 
 
 class CheckboxItem(Flowable):
-    """A checkbox square followed by text."""
+    """A checkbox square followed by text (already converted to reportlab markup)."""
 
     BOX_SIZE = 5
     GAP = 5
 
-    def __init__(self, text: str, checked: bool = False):
+    def __init__(self, markup: str, checked: bool = False):
         super().__init__()
         self.checked = checked
-        self._para = Paragraph(md_to_markup(text), CHECKBOX_TEXT_STYLE)
+        self._para = CachedParagraph(markup, CHECKBOX_TEXT_STYLE)
+        self._wrapped_w = None
 
     def wrap(self, availWidth, availHeight):
-        para_w = availWidth - self.BOX_SIZE - self.GAP
-        w, h = self._para.wrap(para_w, availHeight)
-        self.height = max(h, self.BOX_SIZE + 2)
-        self.width = availWidth
+        if availWidth != self._wrapped_w:
+            para_w = availWidth - self.BOX_SIZE - self.GAP
+            w, h = self._para.wrap(para_w, availHeight)
+            self.height = max(h, self.BOX_SIZE + 2)
+            self.width = availWidth
+            self._wrapped_w = availWidth
         return (self.width, self.height)
 
     def split(self, availWidth, availHeight):
@@ -285,21 +392,26 @@ class BoxFlowable(Flowable):
         super().__init__()
         self.box_title = title
         self.children = children
-        self._wrapped = False
+        # Child (w, h) from the most recent wrap, reused until the width changes
+        self._child_sizes: list[tuple[float, float]] = []
+        self._sized_w = None
 
     def wrap(self, availWidth, availHeight):
         self.width = availWidth
-        inner_w = availWidth - 2 * self.PADDING
+        if availWidth != self._sized_w:
+            inner_w = availWidth - 2 * self.PADDING
+            self._child_sizes = [
+                child.wrap(inner_w, availHeight) for child in self.children
+            ]
+            self._sized_w = availWidth
         total_h = self.TITLE_H + self.PADDING
-        for child in self.children:
-            _, h = child.wrap(inner_w, availHeight)
+        for _, h in self._child_sizes:
             total_h += h + self.ITEM_SPACING
         # Remove last item spacing, add bottom padding
         if self.children:
             total_h -= self.ITEM_SPACING
         total_h += self.PADDING
         self.height = total_h
-        self._wrapped = True
         return (self.width, self.height)
 
     def split(self, availWidth, availHeight):
@@ -326,10 +438,8 @@ class BoxFlowable(Flowable):
         c.drawString(self.PADDING, title_y + 6, self.box_title)
 
         # Draw children
-        inner_w = self.width - 2 * self.PADDING
         y = title_y - self.PADDING
-        for child in self.children:
-            _, h = child.wrap(inner_w, 0)
+        for child, (_, h) in zip(self.children, self._child_sizes):
             y -= h
             child.drawOn(c, self.PADDING, y)
             y -= self.ITEM_SPACING
@@ -341,7 +451,7 @@ class BoxFlowable(Flowable):
 
 
 def _draw_title_page(canvas, doc):
-    """onPage callback for title pages — draws H1 title and rule."""
+    """onPage callback for title pages — draws H1 title (already upper-cased) and rule."""
     title = getattr(doc, "current_title", "")
     if not title:
         return
@@ -349,7 +459,7 @@ def _draw_title_page(canvas, doc):
     canvas.setFont("Inter-Bold", 24)
     canvas.setFillColor(DARK)
     title_y = PAGE_H - MARGIN_TOP + 10
-    canvas.drawString(MARGIN_LEFT, title_y, title.upper())
+    canvas.drawString(MARGIN_LEFT, title_y, title)
     # Horizontal rule
     rule_y = title_y - 8
     canvas.setStrokeColor(DARK)
@@ -363,6 +473,28 @@ def _draw_body_page(canvas, doc):
     pass
 
 
+# Column frame geometry as (x, height, id). Frames carry layout state, so
+# build_doc creates fresh Frame objects from these for every document.
+_TITLE_FRAME_ARGS = [
+    # Title page: shorter columns to leave room for H1 title
+    (COL_X_LEFT, TITLE_COL_H, "title_left"),
+    (COL_X_RIGHT, TITLE_COL_H, "title_right"),
+]
+_BODY_FRAME_ARGS = [
+    # Body page: full-height columns
+    (COL_X_LEFT, BODY_COL_H, "body_left"),
+    (COL_X_RIGHT, BODY_COL_H, "body_right"),
+]
+
+
+def _make_frames(frame_args: list[tuple[float, float, str]]) -> list[Frame]:
+    return [
+        Frame(x, MARGIN_BOTTOM, COL_W, h, id=frame_id, leftPadding=0,
+              rightPadding=0, topPadding=0, bottomPadding=0)
+        for x, h, frame_id in frame_args
+    ]
+
+
 def build_doc(output_path: str) -> BaseDocTemplate:
     doc = BaseDocTemplate(
         output_path,
@@ -374,32 +506,11 @@ def build_doc(output_path: str) -> BaseDocTemplate:
     )
     doc.current_title = ""
 
-    col_x_left = MARGIN_LEFT
-    col_x_right = MARGIN_LEFT + COL_W + GUTTER
-
-    # Title page: shorter columns to leave room for H1 title
-    title_frames = [
-        Frame(col_x_left, MARGIN_BOTTOM, COL_W, TITLE_COL_H,
-              id="title_left", leftPadding=0, rightPadding=0,
-              topPadding=0, bottomPadding=0),
-        Frame(col_x_right, MARGIN_BOTTOM, COL_W, TITLE_COL_H,
-              id="title_right", leftPadding=0, rightPadding=0,
-              topPadding=0, bottomPadding=0),
-    ]
-
-    # Body page: full-height columns
-    body_frames = [
-        Frame(col_x_left, MARGIN_BOTTOM, COL_W, BODY_COL_H,
-              id="body_left", leftPadding=0, rightPadding=0,
-              topPadding=0, bottomPadding=0),
-        Frame(col_x_right, MARGIN_BOTTOM, COL_W, BODY_COL_H,
-              id="body_right", leftPadding=0, rightPadding=0,
-              topPadding=0, bottomPadding=0),
-    ]
-
     doc.addPageTemplates([
-        PageTemplate(id="title_page", frames=title_frames, onPage=_draw_title_page),
-        PageTemplate(id="body_page", frames=body_frames, onPage=_draw_body_page),
+        PageTemplate(id="title_page", frames=_make_frames(_TITLE_FRAME_ARGS),
+                     onPage=_draw_title_page),
+        PageTemplate(id="body_page", frames=_make_frames(_BODY_FRAME_ARGS),
+                     onPage=_draw_body_page),
     ])
 
     return doc
@@ -410,23 +521,28 @@ def build_doc(output_path: str) -> BaseDocTemplate:
 # ---------------------------------------------------------------------------
 
 
-def build_box_children(box: Box) -> list[Flowable]:
+def build_box_children(box: Box, markups: list[str] | None = None) -> list[Flowable]:
     children: list[Flowable] = []
-    for el in box.elements:
-        if el.kind == "paragraph":
-            children.append(Paragraph(md_to_markup(el.text), BODY_STYLE))
-        elif el.kind == "bullet":
-            text = f"\u2022\u2002{md_to_markup(el.text)}"
-            children.append(Paragraph(text, BULLET_STYLE))
-        elif el.kind == "checkbox":
-            children.append(CheckboxItem(el.text, checked=el.checked))
-        elif el.kind == "hrule":
+    if markups is None:
+        markups = [md_to_markup(text) for text in box.texts]
+    for kind, markup, checked in zip(box.kinds, markups, box.checked):
+        if kind == "paragraph":
+            children.append(CachedParagraph(markup, BODY_STYLE))
+        elif kind == "bullet":
+            children.append(CachedParagraph(f"\u2022\u2002{markup}", BULLET_STYLE))
+        elif kind == "checkbox":
+            children.append(CheckboxItem(markup, checked=checked))
+        elif kind == "hrule":
             children.append(HRuleFlowable())
     return children
 
 
 def build_story(pages: list[Page]) -> list[Flowable]:
     story: list[Flowable] = []
+    # Boxes repeated verbatim (e.g. on every page) share their converted
+    # markup. Child flowables are still built per box, since they carry
+    # layout state from their own wrap.
+    markup_cache: dict[tuple[str, ...], list[str]] = {}
     for i, page in enumerate(pages):
         if i > 0:
             # Set title BEFORE page break so onPage callback sees it
@@ -437,17 +553,112 @@ def build_story(pages: list[Page]) -> list[Flowable]:
         for j, box in enumerate(page.boxes):
             if j > 0:
                 story.append(Spacer(1, 10))
-            children = build_box_children(box)
-            story.append(BoxFlowable(box.title, children))
+            texts = tuple(box.texts)
+            markups = markup_cache.get(texts)
+            if markups is None:
+                markups = markup_cache[texts] = [md_to_markup(t) for t in texts]
+            story.append(BoxFlowable(box.title, build_box_children(box, markups)))
     return story
 
 
+# ---------------------------------------------------------------------------
+# PDF generation
+# ---------------------------------------------------------------------------
+
+
+def generate(input_path: Path, output_path: Path) -> int:
+    """Render one markdown file to PDF and return its page count (one per H1)."""
+    register_fonts()
+    pages = parse_markdown(input_path)
+    story = build_story(pages)
+    doc = build_doc(str(output_path))
+    # Set first page title before build so onPage callback sees it
+    if pages:
+        doc.current_title = pages[0].title.upper()
+    doc.build(story)
+    return len(pages)
+
+
+def _batch_output_paths(inputs: list[Path], out_dir: Path) -> list[Path]:
+    """Output path for each input: <out_dir>/<stem>.pdf."""
+    return [out_dir / p.with_suffix(".pdf").name for p in inputs]
+
+
+def _duplicate_outputs(outputs: list[Path]) -> list[Path]:
+    """Output paths that more than one input would write to."""
+    return [p for p, n in Counter(outputs).items() if n > 1]
+
+
+def generate_many(
+    inputs: list[Path], out_dir: Path
+) -> list[tuple[Path, int | Exception]]:
+    """Render each input to <out_dir>/<stem>.pdf in parallel worker processes.
+
+    Returns (output path, page count) pairs in input order; an input that
+    failed to render has its exception in place of the page count. Raises
+    ValueError, before rendering anything, if two inputs share a file name.
+    """
+    outputs = _batch_output_paths(inputs, out_dir)
+    duplicates = _duplicate_outputs(outputs)
+    if duplicates:
+        raise ValueError(
+            "Multiple inputs would write to " + ", ".join(str(p) for p in duplicates)
+        )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor() as ex:
+        futures = [ex.submit(generate, i, o) for i, o in zip(inputs, outputs)]
+    return [
+        (output, future.exception() or future.result())
+        for output, future in zip(outputs, futures)
+    ]
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
+def batch_main(args: list[str]):
+    if len(args) < 2:
+        print("Usage: python checklistpdf.py --batch <input.md>... <out_dir>", file=sys.stderr)
+        sys.exit(1)
+
+    input_paths = [Path(a) for a in args[:-1]]
+    out_dir = Path(args[-1])
+
+    missing = [p for p in input_paths if not p.is_file()]
+    if missing:
+        for p in missing:
+            print(f"Error: Input file not found: {p}", file=sys.stderr)
+        sys.exit(1)
+
+    if out_dir.exists() and not out_dir.is_dir():
+        print(f"Error: Output directory is not a directory: {out_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        results = generate_many(input_paths, out_dir)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    failed = False
+    for input_path, (output_path, result) in zip(input_paths, results):
+        if isinstance(result, Exception):
+            print(f"Error: Failed to generate {output_path} from {input_path}: {result!r}",
+                  file=sys.stderr)
+            failed = True
+        else:
+            print(f"Generated {output_path} ({result} sections)")
+    if failed:
+        sys.exit(1)
+
+
 def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        return
+
     if len(sys.argv) < 2 or len(sys.argv) > 3:
         print("Usage: python checklistpdf.py <input.md> [output.pdf]", file=sys.stderr)
         sys.exit(1)
@@ -459,15 +670,8 @@ def main():
         print(f"Error: Input file not found: {input_path}", file=sys.stderr)
         sys.exit(1)
 
-    register_fonts()
-    pages = parse_markdown(input_path)
-    story = build_story(pages)
-    doc = build_doc(str(output_path))
-    # Set first page title before build so onPage callback sees it
-    if pages:
-        doc.current_title = pages[0].title
-    doc.build(story)
-    print(f"Generated {output_path} ({len(pages)} sections)")
+    count = generate(input_path, output_path)
+    print(f"Generated {output_path} ({count} sections)")
 
 
 if __name__ == "__main__":
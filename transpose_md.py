@@ -6,43 +6,43 @@ H2s become H1s and vice versa, preserving all content.
 """
 
 import sys
-from collections import OrderedDict
+from collections.abc import Iterable
 from pathlib import Path
 
 
-def parse_md(lines: list[str]) -> OrderedDict[str, OrderedDict[str, list[str]]]:
+def parse_md(lines: Iterable[str]) -> dict[str, dict[str, list[str]]]:
     """Parse markdown into {h1: {h2: [content_lines]}} preserving order."""
-    result: OrderedDict[str, OrderedDict[str, list[str]]] = OrderedDict()
+    result: dict[str, dict[str, list[str]]] = {}
     current_h1 = None
-    current_h2 = None
+    # Content list of the current H1/H2 pair, so body lines skip the dict lookups
+    current_content: list[str] | None = None
 
     for line in lines:
         if line.startswith("# "):
             current_h1 = line[2:].strip()
-            current_h2 = None
+            current_content = None
             if current_h1 not in result:
-                result[current_h1] = OrderedDict()
+                result[current_h1] = {}
         elif line.startswith("## ") and current_h1 is not None:
             current_h2 = line[3:].strip()
-            if current_h2 not in result[current_h1]:
-                result[current_h1][current_h2] = []
-        elif current_h1 is not None and current_h2 is not None:
-            result[current_h1][current_h2].append(line)
+            current_content = result[current_h1].setdefault(current_h2, [])
+        elif current_content is not None:
+            current_content.append(line)
 
     return result
 
 
-def transpose(data: OrderedDict[str, OrderedDict[str, list[str]]]) -> OrderedDict[str, OrderedDict[str, list[str]]]:
+def transpose(data: dict[str, dict[str, list[str]]]) -> dict[str, dict[str, list[str]]]:
     """Transpose {h1: {h2: content}} to {h2: {h1: content}}, preserving first-seen order."""
-    phase_order: list[str] = []
+    # dict as an insertion-ordered set: O(1) membership instead of a list scan
+    phase_order: dict[str, None] = {}
     for h2s in data.values():
         for h2 in h2s:
-            if h2 not in phase_order:
-                phase_order.append(h2)
+            phase_order.setdefault(h2, None)
 
-    result: OrderedDict[str, OrderedDict[str, list[str]]] = OrderedDict()
+    result: dict[str, dict[str, list[str]]] = {}
     for phase in phase_order:
-        result[phase] = OrderedDict()
+        result[phase] = {}
         for h1, h2s in data.items():
             if phase in h2s:
                 result[phase][h1] = h2s[phase]
@@ -50,24 +50,26 @@ def transpose(data: OrderedDict[str, OrderedDict[str, list[str]]]) -> OrderedDic
     return result
 
 
-def render_md(data: OrderedDict[str, OrderedDict[str, list[str]]]) -> str:
+def render_md(data: dict[str, dict[str, list[str]]]) -> str:
     """Render transposed structure back to markdown."""
-    sections = []
+    lines: list[str] = []
     for h1, h2s in data.items():
-        lines = [f"# {h1}\n"]
+        if lines:
+            # Blank line between sections
+            lines.append("")
+        lines.append(f"# {h1}\n")
         for h2, content in h2s.items():
             lines.append(f"## {h2}\n")
             # Strip leading/trailing blank lines from content, then add one trailing blank
-            stripped = content
-            while stripped and stripped[0].strip() == "":
-                stripped = stripped[1:]
-            while stripped and stripped[-1].strip() == "":
-                stripped = stripped[:-1]
-            lines.extend(stripped)
+            lo, hi = 0, len(content)
+            while lo < hi and not content[lo].strip():
+                lo += 1
+            while hi > lo and not content[hi - 1].strip():
+                hi -= 1
+            lines.extend(content[lo:hi])
             lines.append("")
-        sections.append("\n".join(lines))
 
-    return "\n\n".join(sections) + "\n"
+    return "\n".join(lines) + "\n"
 
 
 def main():
@@ -81,10 +83,10 @@ def main():
     else:
         output_path = input_path.with_stem(input_path.stem + "_transposed")
 
-    lines = input_path.read_text().splitlines()
-    data = parse_md(lines)
+    with input_path.open(encoding="utf-8") as f:
+        data = parse_md(line.rstrip("\n") for line in f)
     transposed = transpose(data)
-    output_path.write_text(render_md(transposed))
+    output_path.write_text(render_md(transposed), encoding="utf-8")
     print(f"Wrote transposed markdown to {output_path}")
 
 